@@ -2,45 +2,503 @@ import json
 import os
 import argparse
 import sys
-from PIL import Image, ImageDraw, ImageFilter, ImageFont
+from PIL import Image, ImageDraw, ImageFont
 import numpy as np
-from typing import List, Tuple
-import markdown2
+from typing import Dict, List, Optional, Tuple, Union
 from io import BytesIO
-import requests
-from bs4 import BeautifulSoup
-import emoji
-from playwright.sync_api import sync_playwright
-import tempfile
 import base64
 from flask import Flask, request, jsonify, send_file
 import uuid
 import traceback
 import re
+import textwrap
+import functools
+import hashlib
+import threading
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import atexit
 
 app = Flask(__name__)
 
-# 确保输出目录存在
+# 图片输出目录，在需要保存文件时才创建
 OUTPUT_DIR = "gradient_images"
-if not os.path.exists(OUTPUT_DIR):
-    os.makedirs(OUTPUT_DIR)
 
+# markdown截图的磁盘缓存目录，最多保留 SCREENSHOT_CACHE_MAX_FILES 张，超出后删除最久未使用的截图
+SCREENSHOT_CACHE_DIR = os.path.join(OUTPUT_DIR, "_cache")
+SCREENSHOT_CACHE_MAX_FILES = 1000
+
+COLORS_FILE = "color_zh.json"
+
+@functools.lru_cache(maxsize=1)
+def _load_colors_by_id(mtime: float) -> Dict[int, dict]:
+    """读取颜色数据并按ID建立索引，以文件修改时间作为缓存键，文件更新后自动重新加载"""
+    with open(COLORS_FILE, "r", encoding="utf-8") as f:
+        return {int(item["id"]): item for item in json.load(f)}
+
+def get_color_item(color_id: int) -> Optional[dict]:
+    """按ID查找颜色组合，找不到时返回None"""
+    return _load_colors_by_id(os.path.getmtime(COLORS_FILE)).get(color_id)
+
+_HEX_DIGITS_PATTERN = re.compile(r'[0-9a-fA-F]{6}')
+
+@functools.lru_cache(maxsize=512)
 def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
     """将十六进制颜色转换为RGB元组"""
     hex_color = hex_color.lstrip('#')
     if len(hex_color) != 6:
         raise ValueError(f"Invalid color format: {hex_color}")
     
-    try:
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-    except ValueError as e:
-        raise ValueError(f"Invalid color value: {hex_color}") from e
+    # int(..., 16) 也接受 "0x"、"+"、"_" 等写法，需先确认全部是十六进制数字
+    if not _HEX_DIGITS_PATTERN.fullmatch(hex_color):
+        raise ValueError(f"Invalid color value: {hex_color}")
+    value = int(hex_color, 16)
+    return (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF
 
 def is_emoji(char: str) -> bool:
     """判断字符是否是emoji"""
     return any(ord(c) > 0x1F300 for c in char)
 
-def create_gradient_image(width: int, height: int, colors: List[str], output_path: str = None, markdown_content: str = None, background_color: str = "#FFFFFF", direction: str = "bottom-right"):
+def interp_gradient(rgb_colors: List[Tuple[int, int, int]], t: np.ndarray) -> np.ndarray:
+    """按位置 t（0~1）在各颜色之间线性插值，返回形状为 t.shape + (3,) 的 uint8 数组"""
+    stops = np.linspace(0, 1, len(rgb_colors))
+    # 预先分配输出数组，逐通道直接写入，避免中间数组与 np.stack 的整帧拷贝
+    pixels = np.empty(np.shape(t) + (3,), dtype=np.uint8)
+    for channel, values in enumerate(zip(*rgb_colors)):
+        pixels[..., channel] = np.interp(t, stops, values)
+    return pixels
+
+# 截图由后台线程中的 asyncio 事件循环驱动，请求线程把协程提交到该循环后等待结果，
+# 多个请求可以在同一个长驻浏览器中并发渲染，并发页面数由 RENDER_CONCURRENCY 限制
+RENDER_CONCURRENCY = os.cpu_count() or 1
+_render_loop = None
+_render_loop_lock = threading.Lock()
+_playwright = None
+_browser = None
+_browser_lock = None
+_page_slots = None
+
+def _get_render_loop() -> asyncio.AbstractEventLoop:
+    """返回渲染事件循环，首次调用时在后台线程中启动"""
+    global _render_loop
+    with _render_loop_lock:
+        if _render_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="playwright-renderer", daemon=True).start()
+            _render_loop = loop
+    return _render_loop
+
+async def _get_browser():
+    """在渲染事件循环中返回长驻的浏览器实例，首次调用或浏览器断开后重新启动"""
+    global _playwright, _browser, _browser_lock, _page_slots
+    if _browser_lock is None:
+        _browser_lock = asyncio.Lock()
+        _page_slots = asyncio.Semaphore(RENDER_CONCURRENCY)
+    async with _browser_lock:
+        if _playwright is None:
+            # 只有需要截图时才导入Playwright，纯文本和命令行的常见路径无需承担其导入开销
+            from playwright.async_api import async_playwright
+            _playwright = await async_playwright().start()
+        if _browser is None or not _browser.is_connected():
+            _browser = await _playwright.chromium.launch()
+    return _browser
+
+async def _screenshot_html(html: str, viewport_width: int) -> bytes:
+    """在新页面中加载HTML并截图，返回PNG字节"""
+    browser = await _get_browser()
+    async with _page_slots:
+        # 设置初始视口大小
+        page = await browser.new_page(viewport={"width": viewport_width, "height": 1000})
+        try:
+            # 直接加载HTML内容，无需经过临时文件；load 事件会等待页面中的图片加载完成
+            await page.set_content(html, wait_until="load")
+            
+            # 字体以base64内嵌，等待字体就绪即可确定排版完成，无需等待网络空闲
+            await page.evaluate("document.fonts.ready.then(() => true)")
+            
+            # 获取内容高度
+            content_height = await page.evaluate("""() => {
+                const content = document.querySelector('.content');
+                return Math.max(content.scrollHeight, content.offsetHeight);
+            }""")
+            
+            # 设置视口大小为内容实际高度
+            await page.set_viewport_size({"width": viewport_width, "height": content_height})
+            
+            # 截图
+            screenshot = await page.screenshot(type="png", full_page=True)
+        finally:
+            await page.close()
+    return screenshot
+
+def render_html_screenshot(html: str, viewport_width: int) -> bytes:
+    """将截图任务提交到渲染事件循环并等待结果，返回PNG字节"""
+    future = asyncio.run_coroutine_threadsafe(_screenshot_html(html, viewport_width), _get_render_loop())
+    return future.result()
+
+async def _close_browser():
+    global _playwright, _browser
+    if _browser is not None:
+        await _browser.close()
+    if _playwright is not None:
+        await _playwright.stop()
+    _playwright = _browser = None
+
+@atexit.register
+def _shutdown_renderer():
+    """进程退出时关闭浏览器并停止渲染事件循环"""
+    if _render_loop is None:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close_browser(), _render_loop).result(timeout=10)
+    finally:
+        _render_loop.call_soon_threadsafe(_render_loop.stop)
+
+FONT_PATH = "JetBrainsMono-Regular-2.ttf"
+
+@functools.lru_cache(maxsize=None)
+def load_font(size: int) -> ImageFont.FreeTypeFont:
+    """加载并缓存指定字号的文本字体"""
+    return ImageFont.truetype(FONT_PATH, size)
+
+@functools.lru_cache(maxsize=4096)
+def text_width(size: int, text: str) -> float:
+    """返回文本在指定字号下的宽度，按 (字号, 文本) 缓存，重复出现的列表标记和字符无需再次排版字形"""
+    return load_font(size).getlength(text)
+
+@functools.lru_cache(maxsize=None)
+def multiline_spacing(size: int, stroke_width: int = 0) -> int:
+    """返回 multiline_text 的spacing参数，使行距与字体度量给出的行高一致
+
+    multiline_text 的行距为 "A" 的高度加上描边宽度和spacing，这里按字号缓存换算结果
+    """
+    font = load_font(size)
+    return sum(font.getmetrics()) - font.getbbox("A", stroke_width=stroke_width)[3] - stroke_width
+
+@functools.lru_cache(maxsize=None)
+def font_base64() -> str:
+    """读取字体文件并缓存其base64编码，用于嵌入HTML模板的 @font-face"""
+    with open(FONT_PATH, "rb") as f:
+        return base64.b64encode(f.read()).decode()
+
+# 段落文本中可能被解释为Markdown/HTML行内语法的字符、需要高亮的URL，以及只由短横线构成、会被当作分隔线或Setext标题的行
+_INLINE_MARKDOWN_PATTERN = re.compile(r'[#*_`|<>\[\]!~=\\&]|https?://|www\.|^[\s-]*$')
+# HTML模板支持的行首标记：一二级标题、无序列表项、有序列表项
+_SIMPLE_MD_LINE_PATTERN = re.compile(r'(#{1,2}) +(\S.*)|[-*+] +(\S.*)|(\d+)\. +(\S.*)')
+
+# 与HTML模板样式一致的块版式：(字号, 下外边距, 左内边距, 是否为粗体)
+_SIMPLE_MD_BLOCK_STYLES = {
+    'h1': (72, 20, 0, True),
+    'h2': (54, 15, 0, True),
+    'p': (36, 10, 0, False),
+    'ul': (36, 10, 40, False),
+    'ol': (36, 10, 40, False),
+}
+
+def parse_simple_md(content: str) -> Optional[List[Tuple[str, int, List[str]]]]:
+    """逐行解析由一二级标题、段落和无序/有序列表组成的简单Markdown
+
+    Returns:
+        块列表，每项为 (类型, 起始序号, 文本行)，类型为 h1/h2/p/ul/ol，列表的文本行即各列表项；
+        内容不在该子集内（非ASCII、行内语法、缩进、嵌套或松散列表等）时返回None，交给markdown2处理
+    """
+    if not content.isascii():
+        return None
+    
+    blocks = []
+    after_blank = True
+    for line in content.strip().split('\n'):
+        if not line.strip():
+            after_blank = True
+            continue
+        stripped = line.lstrip()
+        if line.startswith(('    ', '\t')) or (stripped != line and _SIMPLE_MD_LINE_PATTERN.match(stripped)):
+            # 代码块以及带缩进的标题、列表项
+            return None
+        
+        match = _SIMPLE_MD_LINE_PATTERN.fullmatch(line)
+        start = 1
+        if match is None:
+            kind, text = 'p', line
+        elif match.group(1):
+            kind, text = ('h1' if len(match.group(1)) == 1 else 'h2'), match.group(2)
+        elif match.group(3):
+            kind, text = 'ul', match.group(3)
+        else:
+            kind, text, start = 'ol', match.group(5), int(match.group(4))
+        text = ' '.join(text.split())
+        if _INLINE_MARKDOWN_PATTERN.search(text) or (kind in ('ul', 'ol') and _SIMPLE_MD_LINE_PATTERN.match(text)):
+            return None
+        
+        previous_kind = blocks[-1][0] if blocks else None
+        if kind in ('h1', 'h2') and not after_blank and previous_kind in ('ul', 'ol'):
+            # 紧跟在列表项后的标题会被markdown2嵌套进该列表项中
+            return None
+        if kind in ('h1', 'h2') or previous_kind in (None, 'h1', 'h2'):
+            blocks.append((kind, start, [text]))
+        elif not after_blank:
+            if previous_kind != kind:
+                # 段落与列表之间没有空行，markdown2的处理方式不同于逐行解析
+                return None
+            blocks[-1][2].append(text)
+        elif kind in ('ul', 'ol') and previous_kind in ('ul', 'ol'):
+            # 空行分隔的列表会被合并为松散列表，列表项包含段落
+            return None
+        else:
+            blocks.append((kind, start, [text]))
+        after_blank = False
+    return blocks
+
+def layout_simple_md(blocks: List[Tuple[str, int, List[str]]], content_width: int) -> Tuple[List[Tuple[float, int, str, ImageFont.FreeTypeFont, bool]], int]:
+    """按HTML模板的版式（20px内边距，各元素的字号、外边距和列表缩进）排版 parse_simple_md 解析出的块
+
+    Returns:
+        (绘制列表, 内容高度)，绘制列表中每项为相对内容区域左上角的 (x, y, 文本, 字体, 是否为粗体)
+    """
+    padding = 20
+    text_ops = []
+    y = padding
+    for kind, start, lines in blocks:
+        font_size, margin_bottom, indent, bold = _SIMPLE_MD_BLOCK_STYLES[kind]
+        font = load_font(font_size)
+        line_height = sum(font.getmetrics())
+        x = padding + indent
+        # 字体为等宽字体，按字符数折行即可
+        max_chars = max(1, int((content_width - padding - x) // text_width(font_size, " ")))
+        
+        if kind in ('ul', 'ol'):
+            # 列表项逐项排版，标记位于内容左侧；最后一项的下外边距与列表的下外边距重叠
+            for number, item in enumerate(lines, start):
+                marker = "\u2022 " if kind == 'ul' else f"{number}. "
+                wrapped = textwrap.wrap(item, max_chars)
+                text_ops.append((x - text_width(font_size, marker), y, marker, font, False))
+                text_ops.append((x, y, '\n'.join(wrapped), font, False))
+                y += len(wrapped) * line_height + margin_bottom
+        else:
+            # 段落内的每一行单独换行，与 break-on-newline 的渲染结果一致
+            wrapped = [wrapped_line for line in lines for wrapped_line in textwrap.wrap(line, max_chars)]
+            text_ops.append((x, y, '\n'.join(wrapped), font, bold))
+            y += len(wrapped) * line_height + margin_bottom
+    return text_ops, y + padding
+
+def draw_text_ops(draw: ImageDraw.ImageDraw, origin: Tuple[int, int], text_ops: List[Tuple[float, int, str, ImageFont.FreeTypeFont, bool]], text_color: str):
+    """在origin处绘制 layout_simple_md 排好的文本，粗体用1px描边模拟浏览器的合成粗体"""
+    for x, y, text, font, bold in text_ops:
+        stroke_width = 1 if bold else 0
+        draw.multiline_text((origin[0] + x, origin[1] + y), text, fill=text_color, font=font, spacing=multiline_spacing(font.size, stroke_width),
+                            stroke_width=stroke_width, stroke_fill=text_color)
+
+@functools.lru_cache(maxsize=128)
+def markdown_to_html(markdown_content: str) -> str:
+    """将markdown转换为HTML片段，URL显示为蓝色链接，结果按内容缓存"""
+    processed_content = markdown_content.replace('\n', '  \n')
+    
+    # 识别并处理URL
+    # 使用正则表达式匹配URL
+    url_pattern = r'(https?://[^\s<>"]+|www\.[^\s<>"]+)'
+    
+    # 将URL替换为带有蓝色样式的HTML
+    def replace_url(match):
+        url = match.group(0)
+        return f'<a href="{url}" style="color: #0066CC; text-decoration: none;">{url}</a>'
+    
+    processed_content = re.sub(url_pattern, replace_url, processed_content)
+    
+    # 使用markdown2转换，启用extras参数以支持更多markdown特性；简单Markdown不经过这里，按需导入
+    import markdown2
+    return markdown2.markdown(processed_content, extras=['fenced-code-blocks', 'tables', 'break-on-newline'])
+
+@functools.lru_cache(maxsize=256)
+def _render_markdown_png(markdown_content: str, content_width: int, background_color: str, text_color: str) -> bytes:
+    """将markdown转换为HTML并用浏览器截图，返回PNG字节
+
+    相同输入的截图同时缓存在内存和 SCREENSHOT_CACHE_DIR 中，重复内容无需再启动浏览器
+    """
+    # 将markdown转换为HTML
+    html_content = markdown_to_html(markdown_content)
+    
+    # 创建HTML模板
+    html_template = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <style>
+            @font-face {{
+                font-family: 'JetBrainsMono';
+                src: url('data:font/ttf;base64,{font_base64()}') format('truetype');
+            }}
+            body {{
+                margin: 0;
+                padding: 0;
+                width: {content_width}px;
+                background-color: transparent;
+                color: {text_color};
+                font-family: 'JetBrainsMono', -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
+            }}
+            .content {{
+                padding: 20px;
+                box-sizing: border-box;
+                width: 100%;
+                background-color: {background_color};
+            }}
+            h1 {{ font-size: 72px; margin: 0 0 20px 0; }}
+            h2 {{ font-size: 54px; margin: 0 0 15px 0; }}
+            p {{ font-size: 36px; margin: 0 0 10px 0; }}
+            ul, ol {{ font-size: 36px; margin: 0 0 10px 0; padding-left: 40px; }}
+            li {{ margin-bottom: 10px; }}
+            img {{ max-width: 100%; height: auto; }}
+            a {{ color: #0066CC; text-decoration: none; }}
+        </style>
+    </head>
+    <body>
+        <div class="content">
+            {html_content}
+        </div>
+    </body>
+    </html>
+    """
+    
+    # 以完整的HTML（包含模板样式和内嵌字体）作为磁盘缓存键，模板或字体变化后旧截图不会再被命中
+    cache_key = hashlib.blake2b(f"{content_width}|{html_template}".encode('utf-8'), digest_size=16).hexdigest()
+    cache_path = os.path.join(SCREENSHOT_CACHE_DIR, f"{cache_key}.png")
+    # 磁盘缓存只是加速手段，目录不可读写或磁盘已满时直接截图，不影响返回结果
+    try:
+        with open(cache_path, 'rb') as f:
+            screenshot = f.read()
+        _touch_cache_file(cache_path)
+        return screenshot
+    except OSError:
+        pass
+    
+    # 使用长驻的Playwright浏览器截图
+    screenshot = render_html_screenshot(html_template, content_width)
+    
+    temp_cache_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        # 先写入临时文件再重命名，避免其他进程读到写了一半的缓存
+        os.makedirs(SCREENSHOT_CACHE_DIR, exist_ok=True)
+        with open(temp_cache_path, 'wb') as f:
+            f.write(screenshot)
+        os.replace(temp_cache_path, cache_path)
+        _prune_screenshot_cache()
+    except OSError as e:
+        print(f"Failed to write screenshot cache: {e}")
+        try:
+            os.remove(temp_cache_path)
+        except OSError:
+            pass
+    return screenshot
+
+def _touch_cache_file(path: str):
+    """更新缓存文件的修改时间，清理时按最近使用时间淘汰"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+def _prune_screenshot_cache():
+    """截图缓存超过 SCREENSHOT_CACHE_MAX_FILES 张时删除最久未使用的截图
+
+    只在写入新截图（即已经调用过浏览器）之后执行，遍历目录的开销相对截图可以忽略；
+    多个进程可能同时清理，文件已被删除时直接跳过
+    """
+    entries = []
+    with os.scandir(SCREENSHOT_CACHE_DIR) as it:
+        for entry in it:
+            if not entry.name.endswith('.png'):
+                continue
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                pass
+    if len(entries) <= SCREENSHOT_CACHE_MAX_FILES:
+        return
+    entries.sort()
+    for _, path in entries[:len(entries) - SCREENSHOT_CACHE_MAX_FILES]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def render_markdown_screenshot(markdown_content: str, content_width: int, background_color: str, text_color: str) -> Image.Image:
+    """将markdown渲染为宽度为content_width的文本层图片"""
+    return Image.open(BytesIO(_render_markdown_png(markdown_content, content_width, background_color, text_color)))
+
+def rounded_rect_sdf(width: int, height: int, radius: int, padding: int = 0, step: int = 1) -> np.ndarray:
+    """计算圆角矩形的有向距离场（矩形内为负、外为正，单位为像素）
+
+    与 ImageDraw 一样包含右、下边界，即矩形覆盖 (width + 1) x (height + 1) 个像素；
+    采样范围向四周各外扩padding像素，每 step x step 个像素取其中心采样一次
+    """
+    half_w = (width + 1) / 2
+    half_h = (height + 1) / 2
+    # 以矩形中心为原点的采样点坐标
+    xs = np.arange(0, width + 1 + 2 * padding, step, dtype=np.float32) + step / 2 - padding - half_w
+    ys = np.arange(0, height + 1 + 2 * padding, step, dtype=np.float32) + step / 2 - padding - half_h
+    qx = (np.abs(xs) - (half_w - radius))[None, :]
+    qy = (np.abs(ys) - (half_h - radius))[:, None]
+    outside = np.hypot(np.maximum(qx, 0), np.maximum(qy, 0))
+    inside = np.minimum(np.maximum(qx, qy), 0)
+    return outside + inside - radius
+
+@functools.lru_cache(maxsize=32)
+def rounded_rect_mask(width: int, height: int, radius: int) -> Image.Image:
+    """生成并缓存抗锯齿的圆角矩形蒙版（L模式，内部为255）"""
+    coverage = np.clip(0.5 - rounded_rect_sdf(width, height, radius), 0, 1)
+    return Image.fromarray((coverage * 255 + 0.5).astype(np.uint8), 'L')
+
+# 1080x1920 的卡片每项约 6 MB（RGB颜色图 + L蒙版），每个工作进程各自缓存一份；
+# 卡片高度随内容变化，不同内容基本不会命中，只保留少量最近的结果
+@functools.lru_cache(maxsize=4)
+def glow_layer(width: int, height: int, radius: int, blur_radius: int, color: Tuple[int, int, int], alpha: int) -> Tuple[Union[Image.Image, Tuple[int, int, int]], Image.Image]:
+    """生成并缓存圆角矩形发光效果的 (颜色, L模式蒙版)，四周各外扩 3 * blur_radius 像素
+
+    效果等同于对颜色为color、不透明度为alpha的RGBA圆角矩形做标准差为blur_radius的高斯模糊后再合成：
+    模糊后的覆盖率为 Φ(-d / σ)，Φ 用 tanh 近似，无需真正执行模糊；RGBA模糊时颜色与周围透明的黑色一起被平均，
+    因此颜色为 color * 覆盖率、不透明度为 alpha * 覆盖率，浅色卡片外围呈现原有的暗色阴影。
+    color为黑色时颜色恒为黑色，直接返回颜色元组而不生成颜色图；两种返回值都可以作为 Image.paste 的填充。
+    发光变化平缓，先按 1/4 分辨率计算再双线性放大，计算量减少到约 1/16
+    """
+    padding = blur_radius * 3
+    step = 4
+    x = -rounded_rect_sdf(width, height, radius, padding, step) / blur_radius
+    cdf = 0.5 * (1 + np.tanh(0.7978845608 * (x + 0.044715 * x ** 3)))
+    coverage = Image.fromarray(cdf.astype(np.float32), 'F')
+    coverage = coverage.resize((coverage.width * step, coverage.height * step), Image.BILINEAR)
+    coverage = np.asarray(coverage.crop((0, 0, width + 1 + 2 * padding, height + 1 + 2 * padding)))
+    
+    mask = Image.fromarray((coverage * alpha + 0.5).astype(np.uint8), 'L')
+    if not any(color):
+        return color, mask
+    colors = Image.fromarray((coverage[..., None] * np.asarray(color, dtype=np.float32) + 0.5).astype(np.uint8), 'RGB')
+    return colors, mask
+
+def build_gradient_lut(rgb_colors: List[Tuple[int, int, int]], steps: int) -> np.ndarray:
+    """预先计算渐变颜色查找表，第 i 项对应位置 i / (steps - 1)，返回形状为 (steps, 3) 的 uint8 数组"""
+    return interp_gradient(rgb_colors, np.linspace(0, 1, steps))
+
+# 每项为一整幅RGB渐变图，1080x1920 时约 6 MB，16 项每个工作进程最多约 100 MB
+@functools.lru_cache(maxsize=16)
+def render_gradient(width: int, height: int, rgb_colors: Tuple[Tuple[int, int, int], ...], direction: str) -> Image.Image:
+    """生成并缓存渐变背景图，调用方需要修改时应先 copy()"""
+    # 先用 NumPy 查表得到整幅像素数组，再一次性交给 PIL
+    if direction == "vertical":
+        lut = build_gradient_lut(rgb_colors, height)
+        pixels = np.broadcast_to(lut[:, None, :], (height, width, 3))
+    elif direction == "horizontal":
+        lut = build_gradient_lut(rgb_colors, width)
+        pixels = np.broadcast_to(lut[None, :, :], (height, width, 3))
+    else:  # bottom-right / diagonal (默认对角线渐变)
+        # 位置 t = (x / width + y / height) / 2，查找表的级数远大于相邻像素的 t 差，量化误差可以忽略
+        steps = width + height
+        scale = (steps - 1) / 2
+        index = np.add.outer(np.arange(height, dtype=np.float32) * (scale / height),
+                             np.arange(width, dtype=np.float32) * (scale / width) + 0.5).astype(np.intp)
+        pixels = build_gradient_lut(rgb_colors, steps)[index]
+    return Image.fromarray(np.ascontiguousarray(pixels), 'RGB')
+
+def create_gradient_image(width: int, height: int, colors: List[str], output_path: str = None, markdown_content: str = None, background_color: str = "#FFFFFF", direction: str = "bottom-right", png_compress_level: int = 1):
     """创建渐变色图片
     
     Args:
@@ -51,6 +509,7 @@ def create_gradient_image(width: int, height: int, colors: List[str], output_pat
         markdown_content: markdown内容
         background_color: 中心矩形的背景色，默认为白色 (#FFFFFF)
         direction: 渐变方向，可选值：vertical（垂直）、horizontal（水平）、diagonal（对角线）、bottom-right（右下角），默认为 bottom-right
+        png_compress_level: PNG压缩级别（0-9），默认为1，级别越高文件越小、编码越慢
     
     Returns:
         BytesIO: 包含图片数据的字节流对象
@@ -58,10 +517,6 @@ def create_gradient_image(width: int, height: int, colors: List[str], output_pat
     if not colors:
         raise ValueError("No colors provided")
     
-    # 创建新图片
-    image = Image.new('RGB', (width, height))
-    draw = ImageDraw.Draw(image)
-    
     try:
         # 将十六进制颜色转换为RGB
         rgb_colors = [hex_to_rgb(color) for color in colors]
@@ -71,37 +526,10 @@ def create_gradient_image(width: int, height: int, colors: List[str], output_pat
         print(f"Error processing colors: {e}")
         return None
     
-    # 根据方向创建渐变
-    if direction == "vertical":
-        steps = height
-        for y in range(height):
-            t = y / (height - 1)
-            color = get_gradient_color(rgb_colors, t)
-            draw.line([(0, y), (width, y)], fill=color)
-    elif direction == "horizontal":
-        steps = width
-        for x in range(width):
-            t = x / (width - 1)
-            color = get_gradient_color(rgb_colors, t)
-            draw.line([(x, 0), (x, height)], fill=color)
-    elif direction == "bottom-right":
-        # 右下角渐变
-        for y in range(height):
-            for x in range(width):
-                # 计算到右下角的距离比例
-                dx = x / width
-                dy = y / height
-                t = (dx + dy) / 2
-                color = get_gradient_color(rgb_colors, t)
-                draw.point((x, y), fill=color)
-    else:  # diagonal (默认对角线渐变)
-        for y in range(height):
-            for x in range(width):
-                dx = x / width
-                dy = y / height
-                t = (dx + dy) / 2
-                color = get_gradient_color(rgb_colors, t)
-                draw.point((x, y), fill=color)
+    # 渐变背景只取决于尺寸、颜色和方向，从缓存中取出后复制一份再绘制卡片；
+    # diagonal 与 bottom-right（以及其他取值）生成的是同一幅图，统一为 diagonal 以共用同一个缓存项
+    gradient_direction = direction if direction in ("vertical", "horizontal") else "diagonal"
+    image = render_gradient(width, height, tuple(rgb_colors), gradient_direction).copy()
 
     # 计算圆角矩形的位置和大小
     rect_width = int(width * 0.8)
@@ -110,230 +538,80 @@ def create_gradient_image(width: int, height: int, colors: List[str], output_pat
     rect_y = (height - rect_height) // 2
     radius = 50
 
-    # 创建发光效果层
-    glow_layer = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    glow_draw = ImageDraw.Draw(glow_layer)
-
     # 判断背景色是否为白色或接近白色
     is_light_background = sum(background_rgb) > 600  # 简单判断，RGB值之和大于600认为是浅色
     
     # 根据背景色设置文字颜色和边框颜色
     text_color = "#333333" if is_light_background else "#FFFFFF"
-    border_color = (255, 255, 255, 100) if is_light_background else (0, 0, 0, 100)
+    border_color = (255, 255, 255) if is_light_background else (0, 0, 0)
+    border_alpha = 100
 
-    # 如果有markdown内容，使用Playwright生成图片
+    text_layer = None
+    text_ops = None
     if markdown_content:
-        # 将markdown转换为HTML
-        processed_content = markdown_content.replace('\\n', '\n')
-        processed_content = processed_content.replace('\n', '  \n')
-        
-        # 识别并处理URL
-        # 使用正则表达式匹配URL
-        url_pattern = r'(https?://[^\s<>"]+|www\.[^\s<>"]+)'
-        
-        # 将URL替换为带有蓝色样式的HTML
-        def replace_url(match):
-            url = match.group(0)
-            return f'<a href="{url}" style="color: #0066CC; text-decoration: none;">{url}</a>'
-        
-        processed_content = re.sub(url_pattern, replace_url, processed_content)
-        
-        # 使用markdown2转换，启用extras参数以支持更多markdown特性
-        html_content = markdown2.markdown(processed_content, extras=['fenced-code-blocks', 'tables', 'break-on-newline'])
-        
-        # 创建HTML模板
-        html_template = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                @font-face {{
-                    font-family: 'JetBrainsMono';
-                    src: url('data:font/ttf;base64,{base64.b64encode(open("JetBrainsMono-Regular-2.ttf", "rb").read()).decode()}') format('truetype');
-                }}
-                body {{
-                    margin: 0;
-                    padding: 0;
-                    width: {rect_width - 2 * radius}px;
-                    background-color: transparent;
-                    color: {text_color};
-                    font-family: 'JetBrainsMono', -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
-                }}
-                .content {{
-                    padding: 20px;
-                    box-sizing: border-box;
-                    width: 100%;
-                    background-color: {background_color};
-                }}
-                h1 {{ font-size: 72px; margin: 0 0 20px 0; }}
-                h2 {{ font-size: 54px; margin: 0 0 15px 0; }}
-                p {{ font-size: 36px; margin: 0 0 10px 0; }}
-                ul, ol {{ font-size: 36px; margin: 0 0 10px 0; padding-left: 40px; }}
-                li {{ margin-bottom: 10px; }}
-                img {{ max-width: 100%; height: auto; }}
-                a {{ color: #0066CC; text-decoration: none; }}
-            </style>
-        </head>
-        <body>
-            <div class="content">
-                {html_content}
-            </div>
-        </body>
-        </html>
-        """
-        
-        # 创建临时HTML文件
-        with tempfile.NamedTemporaryFile(suffix='.html', delete=False) as temp_file:
-            temp_file.write(html_template.encode('utf-8'))
-            temp_html_path = temp_file.name
-        
-        try:
-            # 使用Playwright截图
-            with sync_playwright() as p:
-                browser = p.chromium.launch()
-                page = browser.new_page()
-                
-                # 设置初始视口大小
-                page.set_viewport_size({"width": rect_width - 2 * radius, "height": 1000})
-                
-                # 加载页面
-                page.goto(f"file://{temp_html_path}")
-                
-                # 等待内容加载完成
-                page.wait_for_load_state("networkidle")
-                
-                # 获取内容高度
-                content_height = page.evaluate("""() => {
-                    const content = document.querySelector('.content');
-                    return Math.max(content.scrollHeight, content.offsetHeight);
-                }""")
-                
-                # 设置视口大小为内容实际高度
-                page.set_viewport_size({"width": rect_width - 2 * radius, "height": content_height})
-                
-                # 等待一下确保内容完全渲染
-                page.wait_for_timeout(100)
-                
-                # 截图
-                screenshot = page.screenshot(type="png", full_page=True)
-                browser.close()
-            
-            # 将截图转换为PIL图像
-            text_layer = Image.open(BytesIO(screenshot))
-            
-            # 更新矩形高度为内容高度加上圆角
-            rect_height = content_height + 2 * radius
-            
-            # 重新计算矩形位置，使其垂直居中
-            rect_y = (height - rect_height) // 2
-            
-            # 重新计算发光效果的位置和大小
-            glow_rect_width = rect_width + 20
-            glow_rect_height = rect_height + 20
-            glow_rect_x = (width - glow_rect_width) // 2
-            glow_rect_y = (height - glow_rect_height) // 2
-            glow_radius = radius + 10
-            
-            # 绘制发光效果的四个圆角
-            glow_draw.ellipse([glow_rect_x, glow_rect_y, glow_rect_x + glow_radius * 2, glow_rect_y + glow_radius * 2], fill=border_color)
-            glow_draw.ellipse([glow_rect_x + glow_rect_width - glow_radius * 2, glow_rect_y, glow_rect_x + glow_rect_width, glow_rect_y + glow_radius * 2], fill=border_color)
-            glow_draw.ellipse([glow_rect_x, glow_rect_y + glow_rect_height - glow_radius * 2, glow_rect_x + glow_radius * 2, glow_rect_y + glow_rect_height], fill=border_color)
-            glow_draw.ellipse([glow_rect_x + glow_rect_width - glow_radius * 2, glow_rect_y + glow_rect_height - glow_radius * 2, glow_rect_x + glow_rect_width, glow_rect_y + glow_rect_height], fill=border_color)
-            
-            # 绘制发光效果的矩形主体
-            glow_draw.rectangle([glow_rect_x + glow_radius, glow_rect_y, glow_rect_x + glow_rect_width - glow_radius, glow_rect_y + glow_rect_height], fill=border_color)
-            glow_draw.rectangle([glow_rect_x, glow_rect_y + glow_radius, glow_rect_x + glow_rect_width, glow_rect_y + glow_rect_height - glow_radius], fill=border_color)
-            
-            # 应用模糊效果
-            glow_layer = glow_layer.filter(ImageFilter.GaussianBlur(radius=10))
-            
-            # 绘制主圆角矩形
-            draw.ellipse([rect_x, rect_y, rect_x + radius * 2, rect_y + radius * 2], fill=background_rgb)
-            draw.ellipse([rect_x + rect_width - radius * 2, rect_y, rect_x + rect_width, rect_y + radius * 2], fill=background_rgb)
-            draw.ellipse([rect_x, rect_y + rect_height - radius * 2, rect_x + radius * 2, rect_y + rect_height], fill=background_rgb)
-            draw.ellipse([rect_x + rect_width - radius * 2, rect_y + rect_height - radius * 2, rect_x + rect_width, rect_y + rect_height], fill=background_rgb)
-            
-            # 绘制矩形主体
-            draw.rectangle([rect_x + radius, rect_y, rect_x + rect_width - radius, rect_y + rect_height], fill=background_rgb)
-            draw.rectangle([rect_x, rect_y + radius, rect_x + rect_width, rect_y + rect_height - radius], fill=background_rgb)
-            
-            # 合并发光效果
-            image = Image.alpha_composite(image.convert('RGBA'), glow_layer)
-            
-            # 将文本层合并到主图片
-            image.paste(text_layer, (rect_x + radius, rect_y + radius), text_layer)
-            
-        finally:
-            # 清理临时文件
-            os.unlink(temp_html_path)
-    else:
-        # 如果没有markdown内容，使用默认的矩形高度
-        # 绘制发光效果的四个圆角
-        glow_rect_width = rect_width + 20
-        glow_rect_height = rect_height + 20
-        glow_rect_x = (width - glow_rect_width) // 2
-        glow_rect_y = (height - glow_rect_height) // 2
-        glow_radius = radius + 10
-        
-        glow_draw.ellipse([glow_rect_x, glow_rect_y, glow_rect_x + glow_radius * 2, glow_rect_y + glow_radius * 2], fill=border_color)
-        glow_draw.ellipse([glow_rect_x + glow_rect_width - glow_radius * 2, glow_rect_y, glow_rect_x + glow_rect_width, glow_rect_y + glow_radius * 2], fill=border_color)
-        glow_draw.ellipse([glow_rect_x, glow_rect_y + glow_rect_height - glow_radius * 2, glow_rect_x + glow_radius * 2, glow_rect_y + glow_rect_height], fill=border_color)
-        glow_draw.ellipse([glow_rect_x + glow_rect_width - glow_radius * 2, glow_rect_y + glow_rect_height - glow_radius * 2, glow_rect_x + glow_rect_width, glow_rect_y + glow_rect_height], fill=border_color)
-        
-        # 绘制发光效果的矩形主体
-        glow_draw.rectangle([glow_rect_x + glow_radius, glow_rect_y, glow_rect_x + glow_rect_width - glow_radius, glow_rect_y + glow_rect_height], fill=border_color)
-        glow_draw.rectangle([glow_rect_x, glow_rect_y + glow_radius, glow_rect_x + glow_rect_width, glow_rect_y + glow_rect_height - glow_radius], fill=border_color)
-        
-        # 应用模糊效果
-        glow_layer = glow_layer.filter(ImageFilter.GaussianBlur(radius=10))
-        
-        # 绘制主圆角矩形
-        draw.ellipse([rect_x, rect_y, rect_x + radius * 2, rect_y + radius * 2], fill=background_rgb)
-        draw.ellipse([rect_x + rect_width - radius * 2, rect_y, rect_x + rect_width, rect_y + radius * 2], fill=background_rgb)
-        draw.ellipse([rect_x, rect_y + rect_height - radius * 2, rect_x + radius * 2, rect_y + rect_height], fill=background_rgb)
-        draw.ellipse([rect_x + rect_width - radius * 2, rect_y + rect_height - radius * 2, rect_x + rect_width, rect_y + rect_height], fill=background_rgb)
+        markdown_content = markdown_content.replace('\\n', '\n')
+        content_width = rect_width - 2 * radius
+        blocks = parse_simple_md(markdown_content)
+        if blocks is not None:
+            # 只含标题、段落和列表的简单Markdown直接用PIL排版，无需markdown2和浏览器
+            text_ops, content_height = layout_simple_md(blocks, content_width)
+        else:
+            # 其余内容转换为HTML后使用Playwright截图
+            text_layer = render_markdown_screenshot(markdown_content, content_width, background_color, text_color)
+            content_height = text_layer.height
         
-        # 绘制矩形主体
-        draw.rectangle([rect_x + radius, rect_y, rect_x + rect_width - radius, rect_y + rect_height], fill=background_rgb)
-        draw.rectangle([rect_x, rect_y + radius, rect_x + rect_width, rect_y + rect_height - radius], fill=background_rgb)
+        # 更新矩形高度为内容高度加上圆角
+        rect_height = content_height + 2 * radius
         
-        # 合并发光效果
-        image = Image.alpha_composite(image.convert('RGBA'), glow_layer)
+        # 重新计算矩形位置，使其垂直居中
+        rect_y = (height - rect_height) // 2
+
+    # 计算发光效果的位置和大小
+    glow_rect_width = rect_width + 20
+    glow_rect_height = rect_height + 20
+    glow_rect_x = (width - glow_rect_width) // 2
+    glow_rect_y = (height - glow_rect_height) // 2
+    glow_radius = radius + 10
+    
+    # 发光效果用L模式蒙版表示不透明度，由距离场直接算出模糊后的结果
+    blur_radius = 10
+    blur_padding = blur_radius * 3
+    
+    # 绘制主圆角矩形
+    image.paste(background_rgb, (rect_x, rect_y), rounded_rect_mask(rect_width, rect_height, radius))
+    
+    # 合并发光效果：以蒙版为不透明度直接在RGB图上混合发光颜色，无需转换为RGBA
+    glow_fill, glow_alpha = glow_layer(glow_rect_width, glow_rect_height, glow_radius, blur_radius, border_color, border_alpha)
+    image.paste(glow_fill, (glow_rect_x - blur_padding, glow_rect_y - blur_padding), glow_alpha)
+    
+    if text_layer is not None:
+        # 将文本层合并到主图片，文本层带有不透明的背景色，直接覆盖即可，无需按alpha混合
+        image.paste(text_layer, (rect_x + radius, rect_y + radius))
+    elif text_ops is not None:
+        # 简单Markdown直接绘制在主图片上，无需单独的文本层；先用背景色填充内容区域，与截图路径的效果一致
+        content_box = (rect_x + radius, rect_y + radius, rect_x + radius + content_width, rect_y + radius + content_height)
+        image.paste(background_rgb, content_box)
+        draw_text_ops(ImageDraw.Draw(image), content_box[:2], text_ops, text_color)
 
-    # 创建字节流对象保存图片数据
+    # 创建字节流对象保存图片数据，PNG只编码一次，默认压缩级别1比Pillow默认的6快数倍而体积相差不大
     img_byte_arr = BytesIO()
-    image.convert('RGB').save(img_byte_arr, format='PNG')
+    image.save(img_byte_arr, format='PNG', compress_level=png_compress_level)
     img_byte_arr.seek(0)  # 将指针移回开始位置
     
     # 如果提供了输出路径，则保存图片
     if output_path:
-        image.convert('RGB').save(output_path)
+        if os.path.splitext(output_path)[1].lower() == '.png':
+            # 直接写入已编码的PNG数据
+            with open(output_path, 'wb') as f:
+                f.write(img_byte_arr.getvalue())
+        else:
+            # 其他格式按扩展名重新编码
+            image.save(output_path)
         print(f"Image saved: {output_path}")
     
     # 返回字节流对象
     return img_byte_arr
 
-def get_gradient_color(rgb_colors: List[Tuple[int, int, int]], t: float) -> Tuple[int, int, int]:
-    """计算渐变颜色"""
-    if len(rgb_colors) == 2:
-        r = int(rgb_colors[0][0] * (1 - t) + rgb_colors[1][0] * t)
-        g = int(rgb_colors[0][1] * (1 - t) + rgb_colors[1][1] * t)
-        b = int(rgb_colors[0][2] * (1 - t) + rgb_colors[1][2] * t)
-        return (r, g, b)
-    else:
-        segment = t * (len(rgb_colors) - 1)
-        segment_index = int(segment)
-        segment_t = segment - segment_index
-        
-        if segment_index >= len(rgb_colors) - 1:
-            return rgb_colors[-1]
-        
-        r = int(rgb_colors[segment_index][0] * (1 - segment_t) + rgb_colors[segment_index + 1][0] * segment_t)
-        g = int(rgb_colors[segment_index][1] * (1 - segment_t) + rgb_colors[segment_index + 1][1] * segment_t)
-        b = int(rgb_colors[segment_index][2] * (1 - segment_t) + rgb_colors[segment_index + 1][2] * segment_t)
-        return (r, g, b)
-
 @app.route('/generate_color_picture', methods=['POST'])
 def generate_image():
     try:
@@ -358,6 +636,13 @@ def generate_image():
         markdown_content = data['markdown']
         background_color = data.get('background_color', '#FFFFFF')  # 默认白色
         direction = data.get('direction', 'bottom-right')  # 默认右下角渐变
+        persist = data.get('persist', False)  # 默认不保存文件，只返回图片
+        
+        # 验证persist必须是JSON布尔值，避免 "false"、"0" 等字符串被当作真值
+        if not isinstance(persist, bool):
+            return jsonify({
+                'error': 'Invalid persist value. Must be a boolean (true or false).'
+            }), 400
         
         # 验证背景色格式
         if not background_color.startswith('#') or len(background_color) != 7:
@@ -372,30 +657,28 @@ def generate_image():
                 'error': f'Invalid direction. Must be one of: {", ".join(valid_directions)}'
             }), 400
         
-        # 读取颜色数据
+        # 查找指定ID的颜色
         try:
-            with open("color_zh.json", "r", encoding="utf-8") as f:
-                colors_data = json.load(f)
+            color_item = get_color_item(color_id)
         except Exception as e:
             return jsonify({
                 'error': f'Error reading color data: {str(e)}'
             }), 500
         
-        # 查找指定ID的颜色
-        color_item = next((item for item in colors_data if item["id"] == color_id), None)
         if not color_item:
             return jsonify({
                 'error': f'No color found with ID {color_id}'
             }), 404
         
-        # 确保输出目录存在
-        if not os.path.exists(OUTPUT_DIR):
-            os.makedirs(OUTPUT_DIR)
+        output_path = None
+        if persist:
+            # 确保输出目录存在
+            os.makedirs(OUTPUT_DIR, exist_ok=True)
             
-        # 生成唯一文件名
-        unique_id = str(uuid.uuid4())
-        output_filename = f"gradient_{color_id}_{color_item['name']}_{unique_id}.png"
-        output_path = os.path.join(OUTPUT_DIR, output_filename)
+            # 生成唯一文件名
+            unique_id = str(uuid.uuid4())
+            output_filename = f"gradient_{color_id}_{color_item['name']}_{unique_id}.png"
+            output_path = os.path.join(OUTPUT_DIR, output_filename)
         
         # 创建渐变色图片，使用指定的渐变方向
         img_bytes = create_gradient_image(1080, 1920, color_item['colors'], output_path, markdown_content, background_color, direction)
@@ -411,31 +694,8 @@ def generate_image():
             'details': error_details
         }), 500
 
-def main():
-    parser = argparse.ArgumentParser(description='Generate gradient image for specific color ID')
-    parser.add_argument('id', type=int, help='Color ID to generate image for')
-    parser.add_argument('--markdown', type=str, help='Markdown content to display in the image. If the value starts with "@", it will be treated as a file path to read markdown content from.')
-    parser.add_argument('--background-color', type=str, default='#FFFFFF', help='Background color for the rectangle in hex format (e.g., #FFFFFF for white)')
-    parser.add_argument('--direction', type=str, default='bottom-right', choices=['vertical', 'horizontal', 'diagonal', 'bottom-right'], help='Gradient direction')
-    parser.add_argument('--output', type=str, help='Output file path. If not provided, the image will be saved in the gradient_images directory.')
-    args = parser.parse_args()
-
-    output_dir = "gradient_images"
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-    
-    try:
-        with open("color_zh.json", "r", encoding="utf-8") as f:
-            colors_data = json.load(f)
-    except Exception as e:
-        print(f"Error reading color_zh.json: {e}")
-        return
-    
-    color_item = next((item for item in colors_data if item["id"] == args.id), None)
-    if not color_item:
-        print(f"No color found with ID {args.id}")
-        return
-    
+def render_color_item(color_item: dict, markdown_content: Optional[str], background_color: str, direction: str, png_level: int, output_path: Optional[str] = None):
+    """命令行模式下为单个颜色生成并保存图片，批量生成时在进程池中执行"""
     try:
         id = color_item["id"]
         name = color_item["name"]
@@ -445,40 +705,78 @@ def main():
             print(f"Skipping {name} (ID: {id}) - no colors provided")
             return
         
-        # 处理 markdown 内容
-        markdown_content = args.markdown
-        if markdown_content and markdown_content.startswith('@'):
-            # 从文件中读取 markdown 内容
-            file_path = markdown_content[1:]  # 去掉 @ 符号
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    markdown_content = f.read()
-                print(f"Read markdown content from file: {file_path}")
-            except Exception as e:
-                print(f"Error reading markdown file: {e}")
-                return
-        
-        # 验证背景色格式
-        background_color = args.background_color
-        if not background_color.startswith('#') or len(background_color) != 7:
-            print(f"Invalid background color format: {background_color}. Using default white (#FFFFFF)")
-            background_color = '#FFFFFF'
-        
         # 确定输出路径
-        if args.output:
-            output_path = args.output
-        else:
-            output_path = os.path.join(output_dir, f"gradient_{id}_{name}.png")
+        if not output_path:
+            output_path = os.path.join(OUTPUT_DIR, f"gradient_{id}_{name}.png")
         
         # 创建渐变色图片并获取字节流
-        img_bytes = create_gradient_image(1080, 1920, colors, output_path, markdown_content, background_color, args.direction)
-        print(f"Generated image for {name} (ID: {id}) with background color {background_color} and direction {args.direction}")
+        img_bytes = create_gradient_image(1080, 1920, colors, output_path, markdown_content, background_color, direction, png_level)
+        print(f"Generated image for {name} (ID: {id}) with background color {background_color} and direction {direction}")
         
         # 如果需要返回字节流供进一步处理，可以在这里使用 img_bytes
         
     except Exception as e:
         print(f"Error processing color item: {e}")
 
+def main():
+    parser = argparse.ArgumentParser(description='Generate gradient images for specific color IDs')
+    parser.add_argument('ids', type=int, nargs='+', metavar='id', help='Color ID(s) to generate images for. Multiple IDs are rendered in parallel processes.')
+    parser.add_argument('--markdown', type=str, help='Markdown content to display in the image. If the value starts with "@", it will be treated as a file path to read markdown content from.')
+    parser.add_argument('--background-color', type=str, default='#FFFFFF', help='Background color for the rectangle in hex format (e.g., #FFFFFF for white)')
+    parser.add_argument('--direction', type=str, default='bottom-right', choices=['vertical', 'horizontal', 'diagonal', 'bottom-right'], help='Gradient direction')
+    parser.add_argument('--output', type=str, help='Output file path (single ID only). If not provided, the image will be saved in the gradient_images directory.')
+    parser.add_argument('--png-level', type=int, default=1, choices=range(10), metavar='0-9', help='PNG compression level. Higher levels produce smaller files but encode slower (default: 1)')
+    args = parser.parse_args()
+    
+    # 去除重复的ID，避免多个进程写入同一个文件
+    color_ids = list(dict.fromkeys(args.ids))
+    if args.output and len(color_ids) > 1:
+        parser.error('--output can only be used with a single color ID')
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    
+    # 颜色数据在主进程中读取一次，子进程直接接收颜色条目，无需各自解析JSON
+    try:
+        color_items = [get_color_item(color_id) for color_id in color_ids]
+    except Exception as e:
+        print(f"Error reading color_zh.json: {e}")
+        return
+    
+    for color_id, color_item in zip(color_ids, color_items):
+        if not color_item:
+            print(f"No color found with ID {color_id}")
+    color_items = [color_item for color_item in color_items if color_item]
+    if not color_items:
+        return
+    
+    # 处理 markdown 内容
+    markdown_content = args.markdown
+    if markdown_content and markdown_content.startswith('@'):
+        # 从文件中读取 markdown 内容
+        file_path = markdown_content[1:]  # 去掉 @ 符号
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                markdown_content = f.read()
+            print(f"Read markdown content from file: {file_path}")
+        except Exception as e:
+            print(f"Error reading markdown file: {e}")
+            return
+    
+    # 验证背景色格式
+    background_color = args.background_color
+    if not background_color.startswith('#') or len(background_color) != 7:
+        print(f"Invalid background color format: {background_color}. Using default white (#FFFFFF)")
+        background_color = '#FFFFFF'
+    
+    render = functools.partial(render_color_item, markdown_content=markdown_content, background_color=background_color,
+                               direction=args.direction, png_level=args.png_level)
+    if len(color_items) == 1:
+        render(color_items[0], output_path=args.output)
+    else:
+        # 各颜色的生成互不依赖且以CPU计算为主，用多进程并行生成
+        with ProcessPoolExecutor(max_workers=min(len(color_items), os.cpu_count() or 1)) as executor:
+            list(executor.map(render, color_items))
+
 if __name__ == "__main__":
     # 检查是否有命令行参数
     if len(sys.argv) > 1:
@@ -486,4 +784,4 @@ if __name__ == "__main__":
         main()
     else:
         # 如果没有命令行参数，启动 Flask 服务器
-        app.run(host='0.0.0.0', port=5001, debug=True) 
\ No newline at end of file
+        app.run(host='0.0.0.0', port=5001, threaded=True) 
\ No newline at end of file
@@ -0,0 +1,13 @@
+# Gunicorn 配置：gunicorn -c gunicorn.conf.py color_card_api:app
+import multiprocessing
+
+bind = "0.0.0.0:5001"
+
+# 每个工作进程各自持有一个长驻的 Chromium，进程数按 CPU 核数设置以控制内存占用，
+# 进程内再用多线程处理请求，截图在同一个浏览器中并发执行
+workers = multiprocessing.cpu_count()
+worker_class = "gthread"
+threads = 4
+
+# 首次请求需要启动浏览器，超时时间留出余量
+timeout = 60